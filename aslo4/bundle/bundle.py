@@ -18,23 +18,111 @@ You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import functools
 import hashlib
 import os
+import re
+import shutil
 import subprocess
 import tempfile
 import zipfile
 import logging
-from configparser import ConfigParser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from aslo4.constants import ACTIVITY_BUILD_CLASSIFIER
-from aslo4.lib.utils import split as _s, git_checkout_latest_tag, git_checkout
+from aslo4.lib.utils import git_checkout_latest_tag, git_checkout
 from aslo4.platform import get_executable_path
 
 
 # get the logger
 logger = logging.getLogger("aslo4-builder")
 
+BUF_SIZE = 65536  # copy archive members in 64kb chunks
+
+# keys which activity.info files use to list tags, in order of preference
+TAG_KEYS = ("tags", "category", "tag", "categories")
+
+ACTIVITY_INFO_SECTION_RE = re.compile(r"^\[(?P<section>[^\]]+)\]$")
+ACTIVITY_INFO_KEY_VALUE_RE = re.compile(r"^(?P<key>[\w-]+)\s*[=:]\s*(?P<value>.*?)$")
+
+
+def parse_activity_info(activity_info):
+    """
+    Parses the [Activity] section of an activity.info file.
+    activity.info only holds plain `key = value` entries, so this avoids
+    building a ConfigParser (and its interpolation) for every bundle.
+    As with ConfigParser, keys are lower cased, comment lines are
+    skipped and lines indented deeper than their key continue its
+    value, blank lines included
+    :param activity_info: contents of the activity.info file
+    :type activity_info: str
+    :return: the [Activity] section, None if the section is missing
+    :rtype: Union[dict, None]
+    """
+    activity_section = None
+    section = None
+    key = None
+    key_indent = 0
+    for line in activity_info.splitlines():
+        stripped_line = line.strip()
+        if stripped_line[:1] in ("#", ";"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if key is not None and (not stripped_line or indent > key_indent):
+            # continuation of a multi-line value
+            if section == "Activity":
+                activity_section[key].append(stripped_line)
+            continue
+        if not stripped_line:
+            continue
+        key = None
+        section_match = ACTIVITY_INFO_SECTION_RE.match(stripped_line)
+        if section_match:
+            section = section_match.group("section")
+            if section == "Activity" and activity_section is None:
+                activity_section = dict()
+            continue
+        key_value_match = ACTIVITY_INFO_KEY_VALUE_RE.match(stripped_line)
+        if key_value_match:
+            key = key_value_match.group("key").lower()
+            key_indent = indent
+            if section == "Activity":
+                activity_section[key] = [key_value_match.group("value")]
+    if activity_section is None:
+        return None
+    # trailing blank lines are not part of the value
+    return {
+        key: "\n".join(value_lines).rstrip()
+        for key, value_lines in activity_section.items()
+    }
+
+
+def split_list_value(value):
+    """
+    Splits a list valued activity.info entry like tags. As in sugar,
+    items are separated by ';' only, so `Language Arts` is one tag
+    :param value: raw value read from activity.info
+    :type value: str
+    :return: the stripped, non empty items
+    :rtype: list
+    """
+    return [item.strip() for item in value.split(";") if item.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def _python_exe(python_version):
+    """
+    Returns the path to the python interpreter python_version, falling
+    back to `python`. The lookup is cached so that PATH is scanned once
+    per interpreter instead of once per bundle
+    :param python_version: python2 or python3
+    :type python_version: str
+    :return:
+    :rtype: str
+    """
+    return get_executable_path(python_version, False) or get_executable_path("python")
+
 
 def get_latest_bundle(bundle_path):
     """
@@ -75,6 +163,23 @@ def wait_for_process_completion(proc, retry=False, timeout=120):
     return exit_code
 
 
+def build_bundles(bundles, workers=None, **kwargs):
+    """
+    Builds the .xo of each bundle concurrently by calling
+    Bundle.do_generate_bundle with kwargs. The builds run in
+    subprocesses, so threads are enough to keep the cores busy.
+    Yields the (e_code, stdout, stderr) of each bundle, in order
+    :param bundles: bundles to build
+    :type bundles: list<Bundle>
+    :param workers: number of concurrent builds, defaults to cpu count
+    :type workers: int
+    """
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        yield from executor.map(
+            lambda bundle: bundle.do_generate_bundle(**kwargs), bundles
+        )
+
+
 class BundleError(Exception):
     """
     Raised when the activity.info does not
@@ -100,19 +205,16 @@ class Bundle:
         :param activity_path: A full realpath to the bundle.
         The bundle should have activity/activity.info
         """
-        # initialize config parser
-        config = ConfigParser()
         self._is_xo = False
         self._is_invalid = False
         # path to activity dir / .xo
         self.activity_path = activity_path
+        # the .xo is opened lazily by the archive property
+        self._archive = None
+        self.temp = list()
 
         if str(activity_path).endswith(".xo"):
             self._is_xo = True
-            # its a zipped .xo
-            # read the contents from the zip file
-            self.archive = zipfile.ZipFile(activity_path)
-
             # extract temporary activity name from the archive
             __activity_name = "-".join(
                 activity_path.split(os.path.sep)[-1].split("-")[:-1]
@@ -122,8 +224,12 @@ class Bundle:
             self.activity_info_path = os.path.join(
                 self.bundle_prefix, "activity", "activity.info"
             )
+            # its a zipped .xo
+            # read the contents from the zip file, and close it until
+            # the bundle actually needs the archive again
             try:
-                activity_info_file = self.archive.read(self.activity_info_path).decode()
+                with zipfile.ZipFile(activity_path) as archive:
+                    activity_info_file = archive.read(self.activity_info_path).decode()
             except KeyError:
                 # raises KeyError if the bundle does not have
                 # an activity.info file
@@ -135,7 +241,6 @@ class Bundle:
                     )
                 )
                 return
-            config.read_string(activity_info_file)
 
         else:
             self._is_xo = False
@@ -143,10 +248,15 @@ class Bundle:
                 activity_path, "activity", "activity.info"
             )
             # not a bundle. This is a directory
-            config.read(self.activity_info_path)
+            try:
+                with open(self.activity_info_path, "r", encoding="utf-8") as fp:
+                    activity_info_file = fp.read()
+            except FileNotFoundError:
+                activity_info_file = ""
 
         # Read the activity.info and derive attributes
-        if "Activity" not in config:
+        bundle_activity_section = parse_activity_info(activity_info_file)
+        if bundle_activity_section is None:
             # if the activity does not have a section [Activity]
             # it then might be an invalid activity file
             raise BundleError(
@@ -155,7 +265,6 @@ class Bundle:
                     self.activity_info_path
                 )
             )
-        bundle_activity_section = config["Activity"]
         self._name = bundle_activity_section.get("name")
         self._activity_version = bundle_activity_section.get(
             "activity_version"
@@ -168,12 +277,13 @@ class Bundle:
         self.summary = bundle_activity_section.get("summary")
         self.description = bundle_activity_section.get("description")
         self.url = bundle_activity_section.get("url", "")
-        self.tags = (
-            bundle_activity_section.get("tags", "").split(";")
-            or bundle_activity_section.get("category", "").split(";")
-            or bundle_activity_section.get("tag", "").split(";")
-            or bundle_activity_section.get("categories", "").split(";")
-        )
+        self.tags = list()
+        for tag_key in TAG_KEYS:
+            # use the first of the tag keys present in activity.info
+            tags = bundle_activity_section.get(tag_key)
+            if tags:
+                self.tags = split_list_value(tags)
+                break
         self.screenshots = bundle_activity_section.get("screenshots", "").split()
 
         # bundle specific variables
@@ -183,8 +293,6 @@ class Bundle:
             else get_latest_bundle(os.path.join(self.get_activity_dir(), "dist"))
         )
 
-        self.temp = list()
-
     def __repr__(self):
         """
         Represents the bundle in a human readable format
@@ -216,6 +324,62 @@ class Bundle:
         """
         return self._is_invalid
 
+    @property
+    def archive(self):
+        """
+        The zipfile.ZipFile of the .xo bundle. It is opened on first use
+        and stays open until close() is called
+        :return:
+        :rtype: zipfile.ZipFile
+        """
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.activity_path)
+        return self._archive
+
+    def close(self):
+        """
+        Closes the .xo archive, if it was opened, and removes the
+        temporary files extracted from it
+        :return: None
+        :rtype: None
+        """
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        for temp_folder in self.temp:
+            temp_folder.cleanup()
+        self.temp.clear()
+
+    def __enter__(self):
+        """
+        Lets the bundle be used in a with statement, which closes it
+        on exit
+        >>> with Bundle('path/to/bundle') as bundle:
+        ...     bundle.get_name()
+        :return: the bundle itself
+        :rtype: Bundle
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the bundle, whether or not an exception was raised
+        :return: None, exceptions are not suppressed
+        :rtype: None
+        """
+        self.close()
+
+    def _has_archive_member(self, member):
+        """
+        Checks if member is packaged in the .xo. Uses the archive's
+        name to ZipInfo mapping instead of scanning namelist()
+        :param member: path of the file inside the archive
+        :type member: str
+        :return:
+        :rtype: bool
+        """
+        return member in self.archive.NameToInfo
+
     def get_bundle_created_time(self):
         """
         Returns the time when the bundle was created
@@ -301,23 +465,24 @@ class Bundle:
         icon_path = os.path.join(
             os.path.dirname(self.activity_info_path), "{}.svg".format(self.icon)
         )
+        icon_member = os.path.join(
+            self.bundle_prefix if self.is_xo else "",
+            "activity",
+            "{}.svg".format(self.icon),
+        )
         if self.icon and os.path.exists(icon_path):
             return icon_path
-        elif self.is_xo and self.icon:
+        elif self.is_xo and self.icon and self._has_archive_member(icon_member):
             temp_folder = tempfile.TemporaryDirectory(prefix="saas-icon")
-            self.archive.extract(
-                os.path.join(
-                    self.bundle_prefix, "activity", "{}.svg".format(self.icon)
-                ),
-                path=temp_folder.name,
-            )
             self.temp.append(temp_folder)
-            return os.path.join(
-                temp_folder.name,
-                self.bundle_prefix,
-                "activity",
-                "{}.svg".format(self.icon),
-            )
+            temp_icon_path = os.path.join(temp_folder.name, "{}.svg".format(self.icon))
+            # stream the icon out of the archive in chunks rather than
+            # reading the whole member into memory
+            with self.archive.open(icon_member) as src, open(
+                temp_icon_path, "wb"
+            ) as dst:
+                shutil.copyfileobj(src, dst, BUF_SIZE)
+            return temp_icon_path
         else:
             # return a dummy icon because the current icon was missing
             return os.path.join(
@@ -339,17 +504,24 @@ class Bundle:
             screenshots = []
 
             if self.is_xo:
-                temp_folder = tempfile.TemporaryDirectory(prefix="saas-scr")
-                try:
-                    self.archive.extract(
-                        os.path.join(self.bundle_prefix, "screenshots"),
-                        path=temp_folder.name,
-                    )
-                except KeyError:
+                # walk the central directory once and pick up the
+                # screenshots packaged under screenshots/
+                screenshots_prefix = os.path.join(self.bundle_prefix, "screenshots", "")
+                screenshot_members = [
+                    zip_info
+                    for zip_info in self.archive.infolist()
+                    if zip_info.filename.startswith(screenshots_prefix)
+                    and zip_info.filename.endswith(".png")
+                ]
+                if not screenshot_members:
                     # the screenshots directory does not exists
                     # skip it
                     return []
 
+                temp_folder = tempfile.TemporaryDirectory(prefix="saas-scr")
+                for zip_info in screenshot_members:
+                    self.archive.extract(zip_info, path=temp_folder.name)
+
                 screenshot_directory = os.path.join(
                     temp_folder.name, self.bundle_prefix, "screenshots"
                 )
@@ -483,38 +655,36 @@ class Bundle:
             if override_dist_xo:
                 return exit_code, "", ""
 
-        python3_exe = get_executable_path("python3", False) or get_executable_path(
-            "python"
-        )
-        python2_exe = get_executable_path("python2", False) or get_executable_path(
-            "python"
-        )
-
         # check the type of activity
         if self.get_activity_type() == "python2":
             # in the case the software to be used is sugar-activity
             # use python2 in that case.
-            python_exe = python2_exe
+            python_exe = _python_exe("python2")
         else:
             # use the python3 version to build all the rest of the
             # types of the activities
-            python_exe = python3_exe
+            python_exe = _python_exe("python3")
 
-        proc = subprocess.Popen(
-            _s("{} setup.py dist_xo".format(python_exe)),
-            cwd=self.get_activity_dir(),
-            stderr=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-        )
+        try:
+            # run collects stdout and stderr while waiting, so a chatty
+            # build cannot fill the pipe and stall until the timeout
+            proc = subprocess.run(
+                [python_exe, "setup.py", "dist_xo"],
+                cwd=self.get_activity_dir(),
+                stderr=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                timeout=120,
+            )
+        except subprocess.TimeoutExpired:
+            return -99, "", ""
 
-        # wait for process to complete
-        exit_code = wait_for_process_completion(proc)
+        exit_code = proc.returncode
         if exit_code:
             # process did not complete successfully
             return exit_code, "", ""
 
         # read the stdout and stderr
-        out, err = proc.communicate()
+        out, err = proc.stdout, proc.stderr
 
         if not exit_code:
             dist_path = os.path.join(self.get_activity_dir(), "dist")
@@ -536,7 +706,7 @@ class Bundle:
         :return:
         """
         # get optional flags
-        flags = "" if system else "--user"
+        flags = [] if system else ["--user"]
 
         # check if the current activity is already a bundle
         if self.is_xo:
@@ -544,13 +714,7 @@ class Bundle:
             # by the sugar-toolkit-gtk3 package
             sugar_install_bundle_exe = get_executable_path("sugar-install-bundle")
             proc = subprocess.Popen(
-                _s(
-                    "{exe} {activity_xo} {flag}".format(
-                        exe=sugar_install_bundle_exe,
-                        activity_xo=self.activity_path,
-                        flag=flags,
-                    )
-                ),
+                [sugar_install_bundle_exe, self.activity_path] + flags,
                 cwd=self.get_activity_dir(),
                 stderr=subprocess.PIPE,
                 stdout=subprocess.PIPE,
@@ -559,18 +723,15 @@ class Bundle:
             out, err = proc.communicate()
             return exit_code, out.decode(), err.decode()
 
-        python_exe = get_executable_path("python3", False) or get_executable_path(
-            "python"
-        )
-        proc = subprocess.Popen(
-            _s("{} setup.py install {}".format(python_exe, flags)),
+        python_exe = _python_exe("python3")
+        proc = subprocess.run(
+            [python_exe, "setup.py", "install"] + flags,
             cwd=self.get_activity_dir(),
             stderr=subprocess.PIPE,
             stdout=subprocess.PIPE,
+            timeout=120,
         )
-        exit_code = proc.wait(timeout=120)
-        out, err = proc.communicate()
-        return exit_code, out.decode(), err.decode()
+        return proc.returncode, proc.stdout.decode(), proc.stderr.decode()
 
     def generate_fingerprint_json(self, unique_icons=False):
         """
@@ -611,10 +772,7 @@ class Bundle:
         :return:
         :rtype:
         """
-        if isinstance(self._exec, str) and "sugar-activity3" in self._exec:
-            return True
-        else:
-            return False
+        return isinstance(self._exec, str) and "sugar-activity3" in self._exec
 
     def create_authors_log_file(self):
         """
@@ -646,12 +804,14 @@ class Bundle:
         :rtype: str
         """
         author_raw = subprocess.Popen(
-            _s(
-                '{git} -C {activity_path} -P log --pretty=format:"%an"'.format(
-                    git=get_executable_path("git"),
-                    activity_path=self.get_activity_dir(),
-                )
-            ),
+            [
+                get_executable_path("git"),
+                "-C",
+                self.get_activity_dir(),
+                "-P",
+                "log",
+                "--pretty=format:%an",
+            ],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
@@ -821,11 +981,14 @@ class Bundle:
                 url = r.read()
             return url
         url_process = subprocess.Popen(
-            _s(
-                "{git} -C {path} config --get remote.origin.url".format(
-                    git=get_executable_path("git"), path=self.get_activity_dir()
-                )
-            ),
+            [
+                get_executable_path("git"),
+                "-C",
+                self.get_activity_dir(),
+                "config",
+                "--get",
+                "remote.origin.url",
+            ],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
         )
@@ -64,6 +64,16 @@ FLATPAK_HTML_TEMPLATE = """<div class="card text-white bg-info mb-3" style="bord
     </a>
 </div></div>"""
 
+TAG_BADGE_HTML_TEMPLATE = (
+    """<span class="badge badge-primary saas-badge">{tag}</span>"""
+)
+
+AUTHOR_BADGE_HTML_TEMPLATE = """<span class="badge badge-secondary saas-badge">{author}  <span class="badge badge-dark">{commits}</span></span>"""
+
+LICENSE_BADGE_HTML_TEMPLATE = """<span class="badge badge-info">{lic}</span>"""
+
+CHANGELOG_ITEM_HTML_TEMPLATE = """<li>{log}</li>"""
+
 CHANGELOG_HTML_TEMPLATE = """<div class="saas-activity-changelog">
   <h4>Changelog</h4>
   <pre class="pre-scrollable"><code>{changelog}</code></pre>
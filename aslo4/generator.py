@@ -32,13 +32,18 @@ import zipfile
 import logging
 import smtplib
 
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
 from logging.handlers import RotatingFileHandler
 from jinja2 import FileSystemLoader
 
-from .bundle.bundle import Bundle
+from .bundle.bundle import Bundle, build_bundles
 from .catalog import catalog
 from .constants import CHANGELOG_HTML_TEMPLATE, NEW_FEATURE_HTML_TEMPLATE
+from .constants import CHANGELOG_ITEM_HTML_TEMPLATE
+from .constants import TAG_BADGE_HTML_TEMPLATE
+from .constants import AUTHOR_BADGE_HTML_TEMPLATE
+from .constants import LICENSE_BADGE_HTML_TEMPLATE
 from .constants import SITEMAP_HEADER
 from .constants import SITEMAP_URL
 from .constants import FLATPAK_HTML_TEMPLATE
@@ -47,11 +52,16 @@ from .constants import CAROUSEL_INDICATOR_HTML_TEMPLATE
 from .constants import CAROUSEL_HTML_TEMPLATE
 from .lib.progressbar import progressbar
 from .lib.termcolors import cprint
-from .lib.utils import read_parse_and_write_template
+from .lib.utils import read_parse_and_write_template, write_text_file
 from .platform import get_executable_path
 from . import __version__
 from .rdf.rdf import RDF
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 parser = argparse.ArgumentParser(
     "Sugar Appstore generator", description="Generates static HTML files for ASLOv4"
@@ -89,6 +99,13 @@ parser.add_argument(
 parser.add_argument(
     "--build-chdir", action="store_true", help="Changes directory to Activity dir"
 )
+parser.add_argument(
+    "--build-jobs",
+    type=int,
+    default=None,
+    help="Number of bundles to build at the same time (default: cpu count). "
+    "Each build has a 120s timeout, pass 1 if builds time out",
+)
 parser.add_argument(
     "-l",
     "--list-activities",
@@ -223,6 +240,101 @@ def copytree(src, dst, symlinks=False, ignore=None):
             shutil.copy2(s, d)
 
 
+def read_json(path):
+    """
+    Reads the json file at path. Uses orjson when it is installed,
+    otherwise falls back to the json module
+    """
+    if orjson is not None:
+        with open(path, "rb") as fp:
+            return orjson.loads(fp.read())
+    with open(path, "r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def write_json(data, path):
+    """
+    Serializes data to a compact utf-8 json file at path. The files are
+    only read by the website and the generator, so no whitespace is
+    emitted. Uses orjson when it is installed, otherwise falls back to
+    the json module
+    """
+    if orjson is not None:
+        with open(path, "wb") as fp:
+            fp.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, separators=(",", ":"), ensure_ascii=False)
+
+
+def submit_write(executor, writes, path, content):
+    """
+    Submits the write of content to path to executor. Bundles which
+    share a bundle_id write to the same files, so an earlier write to
+    path is waited for first: the last bundle processed wins, and two
+    writers never truncate the same file at the same time
+    :param executor: pool running the writes
+    :type executor: concurrent.futures.ThreadPoolExecutor
+    :param writes: path to the latest write to it, updated in place
+    :type writes: dict
+    :return: the future of the write
+    :rtype: concurrent.futures.Future
+    """
+    previous_write = writes.get(path)
+    if previous_write is not None:
+        previous_write.result()
+    writes[path] = executor.submit(write_text_file, path, content)
+    return writes[path]
+
+
+def link_or_copy(src, dst_dir):
+    """
+    Hard links src into dst_dir so that large bundles are not rewritten
+    byte by byte. Falls back to a full copy when a hard link cannot be
+    created, e.g. across devices or on filesystems without hard links.
+    The link shares its data with src, so src must never be rewritten in
+    place afterwards: only use it for .xo files from the input directory,
+    not for dist/*.xo which the next build overwrites
+    :return: path to the file in dst_dir
+    :rtype: str
+    """
+    dst = os.path.join(dst_dir, os.path.basename(src))
+    try:
+        os.link(os.path.realpath(src), dst)
+    except OSError:
+        return shutil.copy2(src, dst, follow_symlinks=True)
+    return dst
+
+
+def load_bundle(full_path, do_not_search_for_xo=False):
+    """
+    Returns a Bundle if full_path is a sugar activity directory or a
+    valid .xo bundle, otherwise None
+    """
+    if os.path.isdir(full_path):
+        activity_info_path = os.path.join(full_path, "activity", "activity.info")
+        if os.path.exists(activity_info_path):
+            # If an activity.info exists, its a valid sugar directory.
+            # We do not need to add other directories
+            return Bundle(full_path)
+    elif full_path.endswith(".xo") and not do_not_search_for_xo:
+        # only add the bundle if its a valid zip file. Opening it
+        # directly avoids probing the file a second time with is_zipfile
+        try:
+            bundle = Bundle(full_path)
+        except zipfile.BadZipFile:
+            logger.error("[ERR][BUNDLE] {} is not a valid zip file".format(full_path))
+            return None
+        except OSError as e:
+            # e.g. a dangling symlink or an unreadable file
+            logger.error("[ERR][BUNDLE] Could not open {}: {}".format(full_path, e))
+            return None
+        if not bundle.is_invalid:
+            # skip invalid bundles to prevent conflict
+            return bundle
+    return None
+
+
 def check_progressbar(*arg, **kwarg):
     if kwarg.pop("enable_progressbar"):
         return progressbar(*arg, **kwarg)
@@ -312,29 +424,22 @@ class SaaSBuild:
         if path_to_search_xo is None:
             path_to_search_xo = args.input_directory
 
-        collected_sugar_activity_dirs = list()
-
         directory_items = os.listdir(path_to_search_xo)
         directory_items.sort(reverse=True)
 
-        for bundle_dir in directory_items:
-            # iterate through each activity in the directory
-            full_path = os.path.join(path_to_search_xo, bundle_dir)
-            if os.path.isdir(full_path):
-                activity_info_path = os.path.join(
-                    full_path, "activity", "activity.info"
-                )
-                if os.path.exists(activity_info_path):
-                    # If an activity.info exists, its a valid sugar directory.
-                    # We do not need to add other directories
-                    collected_sugar_activity_dirs.append(Bundle(full_path))
-            elif full_path.endswith(".xo") and not do_not_search_for_xo:
-                if zipfile.is_zipfile(full_path):
-                    # only add the bundle if its a valid zip file
-                    __bundle = Bundle(full_path)
-                    if not __bundle.is_invalid:
-                        # skip invalid bundles to prevent conflict
-                        collected_sugar_activity_dirs.append(__bundle)
+        # reading activity.info from each bundle is independent of the
+        # others, so load them concurrently. map preserves the order
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            loaded_bundles = executor.map(
+                lambda bundle_dir: load_bundle(
+                    os.path.join(path_to_search_xo, bundle_dir),
+                    do_not_search_for_xo=do_not_search_for_xo,
+                ),
+                directory_items,
+            )
+        collected_sugar_activity_dirs = [
+            bundle for bundle in loaded_bundles if bundle is not None
+        ]
 
         logger.debug(
             "[ACTIVITIES] Collected \n{}\n".format(collected_sugar_activity_dirs)
@@ -388,25 +493,42 @@ class SaaSBuild:
             if args.build_override:
                 override = True
 
-        for i in check_progressbar(
-            range(len(activities)),
-            redirect_stdout=True,
-            enable_progressbar=not self.progress_bar_disabled,
-        ):
-            logger.info("[BUILD] Building {}".format(activities[i]))
-            # Add an option to provide additional build script
-            ecode, _, err = activities[i].do_generate_bundle(
-                override_dist_xo=override,
-                entrypoint_build_command=entrypoint_build_script,
-                build_command_chdir=args.build_chdir,
-                checkout_latest_tag=checkout_latest_tag,
+        # do_generate_bundle changes the working directory when
+        # --build-chdir is passed, which is not safe across threads, and
+        # entrypoint scripts are not known to tolerate running in parallel
+        build_jobs = args.build_jobs
+        if args.build_chdir or entrypoint_build_script:
+            build_jobs = 1
+        build_results = build_bundles(
+            activities,
+            workers=build_jobs,
+            override_dist_xo=override,
+            entrypoint_build_command=entrypoint_build_script,
+            build_command_chdir=args.build_chdir,
+            checkout_latest_tag=checkout_latest_tag,
+        )
+        for i, (ecode, _, err) in enumerate(
+            check_progressbar(
+                build_results,
+                max_value=len(activities),
+                redirect_stdout=True,
+                enable_progressbar=not self.progress_bar_disabled,
             )
+        ):
+            logger.info("[BUILD] Built {}".format(activities[i]))
             if err:
                 logger.warning(
                     "[BUILD][W] {} build completed "
                     "with warnings.".format(activities[i])
                 )
                 num_completed_warnings += 1
+            elif ecode == -99:
+                logger.error(
+                    "[BUILD][E] Timed out while building {activity}. "
+                    "Pass --build-jobs 1 to build one bundle "
+                    "at a time".format(activity=activities[i])
+                )
+                num_encountered_errors += 1
             elif ecode:
                 logger.error(
                     "[BUILD][E] Error while building {activity} "
@@ -432,21 +554,27 @@ class SaaSBuild:
         """
         Creates the necessary directories
         """
-        for directory_path in ("icons", "bundles", "app", "api"):
-            rel_path = os.path.join(output_dir, directory_path)
-            if os.path.exists(rel_path):
-                if not args.noconfirm:
-                    # ask user for confirmation before removing directory
-                    proceed = input(
-                        "The operation will remove {}. "
-                        "Are you sure you want to proceed? "
-                        "(Y/n) ".format(rel_path)
-                    )
-                    if proceed not in ("y", "Y"):
-                        logger.error("Terminated on user request.")
-                        sys.exit(-1)
-                shutil.rmtree(rel_path, ignore_errors=True)
-            os.makedirs(rel_path)
+        rel_paths = [
+            os.path.join(output_dir, directory_path)
+            for directory_path in ("icons", "bundles", "app", "api")
+        ]
+        existing_rel_paths = [
+            rel_path for rel_path in rel_paths if os.path.exists(rel_path)
+        ]
+        if existing_rel_paths and not args.noconfirm:
+            # ask user for confirmation once before removing the directories
+            proceed = input(
+                "The operation will remove {}. "
+                "Are you sure you want to proceed? "
+                "(Y/n) ".format(", ".join(existing_rel_paths))
+            )
+            if proceed not in ("y", "Y"):
+                logger.error("Terminated on user request.")
+                sys.exit(-1)
+        for rel_path in existing_rel_paths:
+            shutil.rmtree(rel_path, ignore_errors=True)
+        for rel_path in rel_paths:
+            os.makedirs(rel_path, exist_ok=True)
 
     @staticmethod
     def _process_tags_html(bundle):
@@ -460,15 +588,12 @@ class SaaSBuild:
         """
         # Get the tags and process it
         tags = bundle.get_tags()
-        tags_html_list = []
-        for tag in tags:
-            if all((tag, isinstance(tag, str), tag.strip())):
-                # make sure the tag is a valid non empty string
-                tags_html_list.append(
-                    '<span class="badge badge-primary saas-badge">'
-                    "{tag}</span>".format(tag=tag)
-                )
-        return tags_html_list
+        # make sure the tag is a valid non empty string
+        return [
+            TAG_BADGE_HTML_TEMPLATE.format(tag=tag)
+            for tag in tags
+            if isinstance(tag, str) and tag.strip()
+        ]
 
     @staticmethod
     def _process_authors_html(bundle):
@@ -482,14 +607,10 @@ class SaaSBuild:
         # Get the authors and process it
 
         authors = bundle.get_authors()
-        authors_html_list = []
-        for author in authors:
-            authors_html_list.append(
-                '<span class="badge badge-secondary saas-badge">{author}  '
-                '<span class="badge badge-dark">{commits}</span>'
-                "</span>".format(author=author, commits=authors[author])
-            )
-        return authors_html_list
+        return [
+            AUTHOR_BADGE_HTML_TEMPLATE.format(author=author, commits=commits)
+            for author, commits in authors.items()
+        ]
 
     @staticmethod
     def _process_changelog_html(changelog_latest_version):
@@ -503,10 +624,12 @@ class SaaSBuild:
         html_changelog_latest_version = list()
         if changelog_latest_version:
             changelog_latest_version = html.escape(changelog_latest_version)
-            html_changelog_latest_version = list()
-            for log in changelog_latest_version.split("\n"):
-                log_parsed = log[0:2].replace("*", "") + log[2:]
-                html_changelog_latest_version.append("<li>{}</li>".format(log_parsed))
+            html_changelog_latest_version = [
+                CHANGELOG_ITEM_HTML_TEMPLATE.format(
+                    log=log[0:2].replace("*", "") + log[2:]
+                )
+                for log in changelog_latest_version.split("\n")
+            ]
             if len(html_changelog_latest_version) >= 1:
                 if html_changelog_latest_version[-1] == "<li></li>":
                     html_changelog_latest_version.pop()
@@ -522,33 +645,21 @@ class SaaSBuild:
         :rtype:
         """
         licenses = bundle.get_license()
-        parsed_licenses = list()
-        html_parsed_licenses = list()
-        
-        # Filter out empty or whitespace-only licenses
-        for i in licenses:
-            if i and not i.isspace():
-                parsed_licenses.append(i.strip())
-        
-        # Create HTML badges for valid licenses only if there are any
-        if parsed_licenses:
-            for i in parsed_licenses:
-                html_parsed_licenses.append(
-                    '<span class="badge badge-info">' "{lic}</span>".format(lic=i)
-                )
-        
-        # Return the list of HTML badges (empty if no licenses)
-        return html_parsed_licenses
+        # Create HTML badges, filtering out empty or whitespace-only licenses
+        return [
+            LICENSE_BADGE_HTML_TEMPLATE.format(lic=i.strip())
+            for i in licenses
+            if i and not i.isspace()
+        ]
 
     @staticmethod
     def _process_screenshot_carousel_html(bundle, screenshots_list, output_dir):
         carousel_indicators = list()
         carousel_images = list()
         # copy files to their respective folders
+        # app/ is recreated for every build by create_web_static_directories
         screenshot_dir = os.path.join(output_dir, "app", bundle.get_bundle_id())
-        if os.path.exists(screenshot_dir):
-            shutil.rmtree(screenshot_dir, ignore_errors=True)
-        os.makedirs(screenshot_dir)
+        os.makedirs(screenshot_dir, exist_ok=True)
         for i, screenshot in enumerate(screenshots_list):
             active = ""
             if i == 0:
@@ -625,27 +736,22 @@ class SaaSBuild:
 
         os.makedirs(output_dir, exist_ok=True)
 
-        # check if feed.json exists, if not create it
+        # load feed.json if it exists, otherwise start with an empty feed
+        # which is written at the end of the build
         feed_json = os.path.join(output_dir, "feed.json")
-        if not os.path.exists(feed_json):
-            with open(feed_json, "w") as fp:
-                json.dump(
-                    {
-                        "generated": time.time(),
-                        "bundles": {},
-                    },
-                    fp,
-                )
-
-        with open(feed_json) as fp:
-            feed_json_data = json.load(fp)
+        if os.path.exists(feed_json):
+            feed_json_data = read_json(feed_json)
+        else:
+            feed_json_data = {
+                "generated": time.time(),
+                "bundles": {},
+            }
 
         logger.info("[STATIC] Starting Web Page Static Generation")
 
         if include_flatpaks and os.path.exists(flatpak_file):
             logger.info("[STATIC] Reading flatpak.json")
-            with open(flatpak_file, "r") as r:
-                flatpak_bundle_info = json.load(r)
+            flatpak_bundle_info = read_json(flatpak_file)
         elif include_flatpaks:
             logger.error(
                 "[ERR] flatpak.json was not found in data/.; "
@@ -655,6 +761,18 @@ class SaaSBuild:
 
         output_icon_dir = os.path.join(output_dir, "icons")
         output_bundles_dir = os.path.join(output_dir, "bundles")
+        output_app_dir = os.path.join(output_dir, "app")
+        output_api_dir = os.path.join(output_dir, "api")
+        app_html_template_path = os.path.join(
+            args.pull_static_css_js_html, "templates", "app.html"
+        )
+        domain = (
+            args.generate_sitemap
+            if args.generate_sitemap
+            else "https://activities.sugarlabs.org"
+        )
+        rdf_base_url = "{domain}/bundles".format(domain=domain)
+        rdf_info_url = "{domain}/app".format(domain=domain)
         logger.info("[STATIC] Output directory:{}".format(output_dir))
         logger.info("[STATIC] Output icon directory:{}".format(output_icon_dir))
         logger.info("[STATIC] Output bundle directory:{}".format(output_bundles_dir))
@@ -663,220 +781,269 @@ class SaaSBuild:
         logger.info("[STATIC] Creating static directories: [icons, bundles, app]")
         self.create_web_static_directories(output_dir)
 
+        # the html and RDF files are written in the background as soon as
+        # they are rendered, while the next bundles are processed.
+        # maps each path to the latest write to it
+        writes = dict()
+
         # get the bundles
         bundles = self.list_activities()
-        for bundle in check_progressbar(
-            bundles,
-            redirect_stdout=True,
-            enable_progressbar=not self.progress_bar_disabled,
-        ):
-            logger.debug("[STATIC][{}] Starting build".format(bundle.get_name()))
-            # get the bundle and icon path
-            bundle_path = bundle.get_bundle_path()
-            icon_path = bundle.get_icon_path()
-
-            if not bundle_path:
-                logger.debug(
-                    "[STATIC][{}] Valid dist *.xo was not found. "
-                    "Skipping .".format(bundle.get_name())
-                )
-                # the path to a bundle does not exist
-                # possibly the bundle was not generated / had bugs
-                continue
-
-            logger.debug("[STATIC][{}] Processing tags".format(bundle.get_name()))
-            tags_html_list = self._process_tags_html(bundle)
-
-            # Get the authors and process it
-            logger.debug("[STATIC][{}] Processing authors".format(bundle.get_name()))
-            authors_html_list = self._process_authors_html(bundle)
-
-            # Changelog gen
-            logger.debug("[STATIC][{}] Processing news".format(bundle.get_name()))
-            changelog_latest_version = bundle.get_news()
-            new_in_this_version_raw_html = self._process_changelog_html(
-                changelog_latest_version
-            )
-
-            # changelog all
-            logger.debug(
-                "[STATIC][{}] " "Processing changelog".format(bundle.get_name())
-            )
-            changelog = bundle.get_changelog()
-            if changelog:
-                changelog = html.escape(changelog)
-
-            # get Licenses
-            logger.debug("[STATIC][{}] Processing Licenses".format(bundle.get_name()))
-            html_parsed_licenses = self._process_licenses_html(bundle)
-
-            # copy deps to respective folders
-            logger.debug(
-                "[STATIC][{}] " "Copying Dependencies".format(bundle.get_name())
-            )
-            _bundle_path = shutil.copy2(
-                bundle_path, output_bundles_dir, follow_symlinks=True
-            )
-            if args.unique_icons:
-                _icon_path = shutil.copy2(
-                    icon_path,
-                    os.path.join(
-                        output_icon_dir, "{}.svg".format(bundle.get_bundle_id())
-                    ),
-                    follow_symlinks=True,
-                )
-            else:
-                _icon_path = shutil.copy2(
-                    icon_path, output_icon_dir, follow_symlinks=True
-                )
-
-            # get git url
-            logger.debug(
-                "[STATIC][{}] "
-                "Getting URL to git repository".format(bundle.get_name())
-            )
-            bundle_git_url_stripped = bundle.get_git_url()
-            if (
-                isinstance(bundle_git_url_stripped, str)
-                and bundle_git_url_stripped[-4:] == ".git"
+        with ThreadPoolExecutor(max_workers=8) as file_writer:
+            for bundle in check_progressbar(
+                bundles,
+                redirect_stdout=True,
+                enable_progressbar=not self.progress_bar_disabled,
             ):
-                bundle_git_url_stripped = bundle_git_url_stripped[:-4]
+                # the .xo file handle and extracted temporary files are
+                # released when the bundle is done with, even on errors
+                with bundle:
+                    logger.debug(
+                        "[STATIC][{}] Starting build".format(bundle.get_name())
+                    )
+                    # get the bundle and icon path
+                    bundle_path = bundle.get_bundle_path()
+                    icon_path = bundle.get_icon_path()
+
+                    if not bundle_path:
+                        logger.debug(
+                            "[STATIC][{}] Valid dist *.xo was not found. "
+                            "Skipping .".format(bundle.get_name())
+                        )
+                        # the path to a bundle does not exist
+                        # possibly the bundle was not generated / had bugs
+                        continue
+
+                    logger.debug(
+                        "[STATIC][{}] Processing tags".format(bundle.get_name())
+                    )
+                    tags_html_list = self._process_tags_html(bundle)
 
-            # check if flatpak is supported
-            logger.debug(
-                "[STATIC][{}] " "Checking flatpak support".format(bundle.get_name())
-            )
-            if include_flatpaks and flatpak_bundle_info.get(bundle_git_url_stripped):
-                flatpak_html_div = FLATPAK_HTML_TEMPLATE.format(
-                    activity_name=bundle.get_name(),
-                    bundle_id=flatpak_bundle_info.get(bundle_git_url_stripped)[
-                        "bundle-id"
-                    ],
-                )
-            else:
-                flatpak_html_div = ""
-
-            # if screenshots need to be added as in a carousel, add them
-            logger.debug("[STATIC][{}] Adding screenshots".format(bundle.get_name()))
-            carousel_div = ""
-            screenshots_list = bundle.get_screenshots()
-            if include_screenshots and len(screenshots_list) >= 1:
-                carousel_div = self._process_screenshot_carousel_html(
-                    bundle, screenshots_list, output_dir
-                )
+                    # Get the authors and process it
+                    logger.debug(
+                        "[STATIC][{}] Processing authors".format(bundle.get_name())
+                    )
+                    authors_html_list = self._process_authors_html(bundle)
 
-            if len(new_in_this_version_raw_html):
-                new_in_this_version_parsed = NEW_FEATURE_HTML_TEMPLATE.format(
-                    new_features="".join(new_in_this_version_raw_html)
-                )
-            else:
-                new_in_this_version_parsed = ""
+                    # Changelog gen
+                    logger.debug(
+                        "[STATIC][{}] Processing news".format(bundle.get_name())
+                    )
+                    changelog_latest_version = bundle.get_news()
+                    new_in_this_version_raw_html = self._process_changelog_html(
+                        changelog_latest_version
+                    )
 
-            if changelog and isinstance(changelog, str) and changelog.strip():
-                changelog_formatted_html = CHANGELOG_HTML_TEMPLATE.format(
-                    changelog=changelog
-                )
-            else:
-                changelog_formatted_html = ""
+                    # changelog all
+                    logger.debug(
+                        "[STATIC][{}] " "Processing changelog".format(bundle.get_name())
+                    )
+                    changelog = bundle.get_changelog()
+                    if changelog:
+                        changelog = html.escape(changelog)
 
-            # get the HTML_TEMPLATE and annotate with the saved
-            # information
-            logger.debug(
-                "[STATIC][{}] Generating static HTML".format(bundle.get_name())
-            )
-            output_html_file_name_path = os.path.join(
-                output_dir, "app", "{}.html".format(bundle.get_bundle_id())
-            )
-            # write the html file to specified path
-            logger.debug("[STATIC][{}] Writing static HTML".format(bundle.get_name()))
-            read_parse_and_write_template(
-                file_system_loader=self.file_system_loader,
-                html_template_path=os.path.join(
-                    args.pull_static_css_js_html, "templates", "app.html"
-                ),
-                html_output_path=output_html_file_name_path,
-                title=bundle.get_name(),
-                version=bundle.get_version(),
-                summary=bundle.get_summary(),
-                description=bundle.get_description(),
-                licenses="".join(html_parsed_licenses),
-                description_html_div="",
-                # TODO: Extract from README.md
-                bundle_path="/bundles/{}".format(_bundle_path.split(os.path.sep)[-1]),
-                tag_list_html_formatted="".join(tags_html_list),
-                author_list_html_formatted="".join(authors_html_list),
-                icon_path="/icons/{}".format(_icon_path.split(os.path.sep)[-1]),
-                new_feature_html_div=new_in_this_version_parsed,
-                changelog_html_div=changelog_formatted_html,
-                git_url=bundle.get_git_url(),
-                flatpak_html_div=flatpak_html_div,
-                carousel=carousel_div,
-            )
+                    # get Licenses
+                    logger.debug(
+                        "[STATIC][{}] Processing Licenses".format(bundle.get_name())
+                    )
+                    html_parsed_licenses = self._process_licenses_html(bundle)
 
-            logger.debug("[STATIC][{}] Generating RDF data".format(bundle.get_name()))
-            domain = (
-                args.generate_sitemap
-                if args.generate_sitemap
-                else "https://activities.sugarlabs.org"
-            )
-            rdf = RDF(
-                bundle_id=bundle.get_bundle_id(),
-                bundle_version=bundle.get_version(),
-                bundle_path=bundle_path,
-                min_version="0.116",
-                max_version="0.117",
-                base_url="{domain}/bundles".format(domain=domain),
-                info_url="{domain}/app".format(domain=domain),
-            )
-            parsed_rdf = rdf.parse()
+                    # copy deps to respective folders
+                    logger.debug(
+                        "[STATIC][{}] " "Copying Dependencies".format(bundle.get_name())
+                    )
+                    if bundle.is_xo:
+                        _bundle_path = link_or_copy(bundle_path, output_bundles_dir)
+                    else:
+                        # bundles built from a directory are rewritten in place
+                        # by the next build, so they cannot be hard linked
+                        _bundle_path = shutil.copy2(
+                            bundle_path, output_bundles_dir, follow_symlinks=True
+                        )
+                    if args.unique_icons:
+                        _icon_path = shutil.copy2(
+                            icon_path,
+                            os.path.join(
+                                output_icon_dir, "{}.svg".format(bundle.get_bundle_id())
+                            ),
+                            follow_symlinks=True,
+                        )
+                    else:
+                        _icon_path = shutil.copy2(
+                            icon_path, output_icon_dir, follow_symlinks=True
+                        )
+
+                    # get git url
+                    logger.debug(
+                        "[STATIC][{}] "
+                        "Getting URL to git repository".format(bundle.get_name())
+                    )
+                    bundle_git_url = bundle.get_git_url()
+                    bundle_git_url_stripped = bundle_git_url
+                    if (
+                        isinstance(bundle_git_url_stripped, str)
+                        and bundle_git_url_stripped[-4:] == ".git"
+                    ):
+                        bundle_git_url_stripped = bundle_git_url_stripped[:-4]
+
+                    # check if flatpak is supported
+                    logger.debug(
+                        "[STATIC][{}] "
+                        "Checking flatpak support".format(bundle.get_name())
+                    )
+                    if include_flatpaks and flatpak_bundle_info.get(
+                        bundle_git_url_stripped
+                    ):
+                        flatpak_html_div = FLATPAK_HTML_TEMPLATE.format(
+                            activity_name=bundle.get_name(),
+                            bundle_id=flatpak_bundle_info.get(bundle_git_url_stripped)[
+                                "bundle-id"
+                            ],
+                        )
+                    else:
+                        flatpak_html_div = ""
+
+                    # if screenshots need to be added as in a carousel, add them
+                    carousel_div = ""
+                    if include_screenshots:
+                        # screenshots of an .xo are extracted to temporary files,
+                        # so they are only looked up when they are going to be used
+                        logger.debug(
+                            "[STATIC][{}] Adding screenshots".format(bundle.get_name())
+                        )
+                        screenshots_list = bundle.get_screenshots()
+                        if len(screenshots_list) >= 1:
+                            carousel_div = self._process_screenshot_carousel_html(
+                                bundle, screenshots_list, output_dir
+                            )
+
+                    if len(new_in_this_version_raw_html):
+                        new_in_this_version_parsed = NEW_FEATURE_HTML_TEMPLATE.format(
+                            new_features="".join(new_in_this_version_raw_html)
+                        )
+                    else:
+                        new_in_this_version_parsed = ""
+
+                    if changelog and isinstance(changelog, str) and changelog.strip():
+                        changelog_formatted_html = CHANGELOG_HTML_TEMPLATE.format(
+                            changelog=changelog
+                        )
+                    else:
+                        changelog_formatted_html = ""
+
+                    # get the HTML_TEMPLATE and annotate with the saved
+                    # information
+                    logger.debug(
+                        "[STATIC][{}] Generating static HTML".format(bundle.get_name())
+                    )
+                    output_html_file_name_path = os.path.join(
+                        output_app_dir, "{}.html".format(bundle.get_bundle_id())
+                    )
+                    # render the html now, it is written with the other pages
+                    logger.debug(
+                        "[STATIC][{}] Rendering static HTML".format(bundle.get_name())
+                    )
+                    rendered_html = read_parse_and_write_template(
+                        file_system_loader=self.file_system_loader,
+                        html_template_path=app_html_template_path,
+                        title=bundle.get_name(),
+                        version=bundle.get_version(),
+                        summary=bundle.get_summary(),
+                        description=bundle.get_description(),
+                        licenses="".join(html_parsed_licenses),
+                        description_html_div="",
+                        # TODO: Extract from README.md
+                        bundle_path="/bundles/{}".format(
+                            _bundle_path.split(os.path.sep)[-1]
+                        ),
+                        tag_list_html_formatted="".join(tags_html_list),
+                        author_list_html_formatted="".join(authors_html_list),
+                        icon_path="/icons/{}".format(_icon_path.split(os.path.sep)[-1]),
+                        new_feature_html_div=new_in_this_version_parsed,
+                        changelog_html_div=changelog_formatted_html,
+                        git_url=bundle_git_url,
+                        flatpak_html_div=flatpak_html_div,
+                        carousel=carousel_div,
+                    )
+                    bundle_writes = [
+                        submit_write(
+                            file_writer,
+                            writes,
+                            output_html_file_name_path,
+                            rendered_html,
+                        )
+                    ]
+
+                    logger.debug(
+                        "[STATIC][{}] Generating RDF data".format(bundle.get_name())
+                    )
+                    rdf = RDF(
+                        bundle_id=bundle.get_bundle_id(),
+                        bundle_version=bundle.get_version(),
+                        bundle_path=bundle_path,
+                        min_version="0.116",
+                        max_version="0.117",
+                        base_url=rdf_base_url,
+                        info_url=rdf_info_url,
+                    )
+                    parsed_rdf = rdf.parse()
 
-            logger.debug("[STATIC][{}] Writing RDF".format(bundle.get_name()))
-            with open(
-                os.path.join(
-                    output_dir, "api", "{}.xml".format(bundle.get_bundle_id())
-                ),
-                "w",
-            ) as w:
-                w.write(parsed_rdf)
-
-            # update the index files
-            logger.debug("[STATIC][{}] Adding JSON".format(bundle.get_name()))
-            self.index.append(
-                bundle.generate_fingerprint_json(unique_icons=args.unique_icons)
-            )
+                    output_rdf_file_path = os.path.join(
+                        output_api_dir, "{}.xml".format(bundle.get_bundle_id())
+                    )
+                    bundle_writes.append(
+                        submit_write(
+                            file_writer, writes, output_rdf_file_path, parsed_rdf
+                        )
+                    )
 
-            # check the database and then update if necessary
-            # this will help to check if new bundles are created, and then
-            # accordingly call a hook.
-            bundle_id = bundle.get_bundle_id()
-            bundle_version = bundle.get_version()
+                    # update the index files
+                    logger.debug("[STATIC][{}] Adding JSON".format(bundle.get_name()))
+                    self.index.append(
+                        bundle.generate_fingerprint_json(unique_icons=args.unique_icons)
+                    )
 
-            saved_bundle_version = feed_json_data["bundles"].get(bundle_id)
-            saved_bundle_version = (
-                0 if saved_bundle_version is None else saved_bundle_version
-            )
-            should_create_release_email = saved_bundle_version != bundle_version
-            try:
-                should_create_release_email = float(saved_bundle_version) < float(
-                    bundle_version
-                )
-            except ValueError:
-                pass
+                    # check the database and then update if necessary
+                    # this will help to check if new bundles are created, and then
+                    # accordingly call a hook.
+                    bundle_id = bundle.get_bundle_id()
+                    bundle_version = bundle.get_version()
 
-            if should_create_release_email:
-                print(
-                    "[STATIC][FEED][{}] New release detected {}".format(
-                        bundle_id, bundle_version
+                    saved_bundle_version = feed_json_data["bundles"].get(bundle_id)
+                    saved_bundle_version = (
+                        0 if saved_bundle_version is None else saved_bundle_version
                     )
-                )
-                feed_json_data["bundles"][bundle_id] = bundle_version
-                # handle any items like sending emails to the respective
-                self.new_version_detected_hook(bundle)
+                    should_create_release_email = saved_bundle_version != bundle_version
+                    try:
+                        should_create_release_email = float(
+                            saved_bundle_version
+                        ) < float(bundle_version)
+                    except ValueError:
+                        pass
+
+                    if should_create_release_email:
+                        print(
+                            "[STATIC][FEED][{}] New release detected {}".format(
+                                bundle_id, bundle_version
+                            )
+                        )
+                        feed_json_data["bundles"][bundle_id] = bundle_version
+                        # the announced page has to exist before it is announced
+                        for write in bundle_writes:
+                            write.result()
+                        # handle any items like sending emails to the respective
+                        self.new_version_detected_hook(bundle)
+
+            # leaving the with block waits for the pending writes
+            logger.info(
+                "[STATIC] Waiting for {} HTML and RDF files".format(len(writes))
+            )
+        # raise the errors of the writers, if any
+        for write in writes.values():
+            write.result()
 
         logger.info("[STATIC] Writing Index file (index.json)")
         # write the json to the file
-        with open(os.path.join(output_dir, "index.json"), "w") as w:
-            json.dump(self.index, w)
+        write_json(self.index, os.path.join(output_dir, "index.json"))
         logger.info(
             "Index file containing {n} items have been written "
             "successfully".format(n=len(self.index))
@@ -890,8 +1057,7 @@ class SaaSBuild:
 
         # write the feed.json
         feed_json_data["generated"] = time.time()
-        with open(feed_json, "w") as fp:
-            json.dump(feed_json_data, fp)
+        write_json(feed_json_data, feed_json)
 
     def unpack_static(self, extract_dir):
         """
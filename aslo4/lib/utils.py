@@ -18,6 +18,7 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import functools
 import os
 import shlex
 import subprocess
@@ -137,6 +138,37 @@ def git_checkout(path_to_git_repository, branch="master"):
     return 0
 
 
+def write_text_file(path, content):
+    """
+    Writes content to the file at path
+    :param path: Path to the file
+    :type path: str
+    :param content: text to write
+    :type content: str
+    :return: None
+    :rtype: None
+    """
+    with open(path, "w") as w:
+        w.write(content)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(file_system_loader, html_template_path):
+    """
+    Reads the HTML template and compiles it with jinja. jinja generates
+    and compiles python code for every template, so the compiled
+    template is cached and reused for every page rendered from it
+    :param file_system_loader: jinja2 FileSystemLoader
+    :type file_system_loader: jinja2.FileSystemLoader
+    :param html_template_path: Path to the HTML template
+    :type html_template_path: str
+    :return:
+    :rtype: jinja2.Template
+    """
+    with open(html_template_path, "r") as _buffer:
+        return Environment(loader=file_system_loader).from_string(_buffer.read())
+
+
 def read_parse_and_write_template(
     file_system_loader, html_template_path, html_output_path=None, **kwargs
 ):
@@ -161,10 +193,7 @@ def read_parse_and_write_template(
         output_path_file_name = html_template_path
 
     logger.info("[STATIC] Reading template: {}".format(output_path_file_name))
-    with open(html_template_path, "r") as _buffer:
-        html_template = Environment(loader=file_system_loader).from_string(
-            _buffer.read()
-        )
+    html_template = compile_template(file_system_loader, html_template_path)
 
     logger.info("[STATIC] Writing parsed template: {}".format(output_path_file_name))
 
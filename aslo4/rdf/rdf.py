@@ -1,5 +1,6 @@
 import os
 import hashlib
+import mmap
 import uuid
 
 BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
@@ -36,12 +37,22 @@ def get_sha256(filepath):
     sha256 = hashlib.sha256()
 
     with open(filepath, "rb") as f:
-        while True:
-            data = f.read(BUF_SIZE)
-            if not data:
-                break
-            md5.update(data)
-            sha256.update(data)
+        try:
+            # map the bundle into memory so that it is hashed in a single
+            # update, without copying it into python bytes chunk by chunk
+            mapped_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # empty files cannot be mapped, read them in chunks instead
+            while True:
+                data = f.read(BUF_SIZE)
+                if not data:
+                    break
+                md5.update(data)
+                sha256.update(data)
+        else:
+            with mapped_file:
+                md5.update(mapped_file)
+                sha256.update(mapped_file)
     return {"md5": md5.hexdigest(), "sha256": sha256.hexdigest()}
 
 